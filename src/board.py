@@ -1,22 +1,173 @@
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+import random
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+from .patterns import score_line
 
 Position = Tuple[int, int]
+# ("R", row), ("C", column), ("D", x - y) or ("A", x + y)
+LineKey = Tuple[str, int]
+# (line, index in line, 3 ** index) for each of the four lines through a cell
+CellLines = Tuple[Tuple[LineKey, int, int], ...]
 
+_ZOBRIST_TABLES: Dict[int, List[List[Tuple[int, int]]]] = {}
+_LINE_LAYOUTS: Dict[int, Tuple[Dict[LineKey, int], List[List[CellLines]]]] = {}
+_NEIGHBOR_MASKS: Dict[Tuple[int, int], List[int]] = {}
+# For a five-cell window: the two empty offsets and the three stone offsets of a
+# window that one more stone turns into a four
+_FOUR_WINDOWS = [
+    (i, j, tuple(k for k in range(5) if k not in (i, j)))
+    for i, j in combinations(range(5), 2)
+]
 
-class Board:
+
+def _zobrist_table(size: int) -> List[List[Tuple[int, int]]]:
+    # One (black, white) pair of 64-bit keys per cell, shared by every board of this size
+    table = _ZOBRIST_TABLES.get(size)
+    if table is None:
+        rng = random.Random(size)
+        table = [
+            [(rng.getrandbits(64), rng.getrandbits(64)) for _ in range(size)]
+            for _ in range(size)
+        ]
+        _ZOBRIST_TABLES[size] = table
+    return table
+
+
+def _line_layout(size: int) -> Tuple[Dict[LineKey, int], List[List[CellLines]]]:
+    # Length of every row, column and diagonal, plus the line slots of each cell
+    layout = _LINE_LAYOUTS.get(size)
+    if layout is None:
+        lengths: Dict[LineKey, int] = {}
+        for i in range(size):
+            lengths[("R", i)] = size
+            lengths[("C", i)] = size
+        for d in range(-size + 1, size):
+            lengths[("D", d)] = size - abs(d)
+        for d in range(0, 2 * size - 1):
+            lengths[("A", d)] = size - abs(d - size + 1)
+        cells = [
+            [
+                tuple(
+                    (key, idx, 3**idx)
+                    for key, idx in (
+                        (("R", x), y),
+                        (("C", y), x),
+                        (("D", x - y), min(x, y)),
+                        (("A", x + y), x - max(0, x + y - size + 1)),
+                    )
+                )
+                for y in range(size)
+            ]
+            for x in range(size)
+        ]
+        layout = (lengths, cells)
+        _LINE_LAYOUTS[size] = layout
+    return layout
+
+
+def _neighbor_masks(size: int, radius: int) -> List[int]:
+    # Per cell (index x * size + y), the bitboard of every other cell within `radius`
+    masks = _NEIGHBOR_MASKS.get((size, radius))
+    if masks is None:
+        stride = size + 1
+        masks = []
+        for x in range(size):
+            for y in range(size):
+                mask = 0
+                for nx in range(max(x - radius, 0), min(x + radius, size - 1) + 1):
+                    for ny in range(max(y - radius, 0), min(y + radius, size - 1) + 1):
+                        mask |= 1 << (nx * stride + ny)
+                masks.append(mask & ~(1 << (x * stride + y)))
+        _NEIGHBOR_MASKS[(size, radius)] = masks
+    return masks
 
 
+class Board:
+    __slots__ = (
+        "size",
+        "grid",
+        "moves",
+        "stone_count",
+        "_str_cache",
+        "zobrist",
+        "hash",
+        "stride",
+        "full_mask",
+        "black",
+        "white",
+        "occ",
+        "shifts",
+        "neighbor_mask",
+        "near",
+        "_near_stack",
+        "cell_lines",
+        "lines",
+        "line_codes",
+        "line_scores",
+        "score_black",
+        "score_white",
+    )
+
     def __init__(self, size: int = 15):
         self.size = size
-        self.grid: List[List[int]] = [[0 for _ in range(size)] for _ in range(size)]
+        # Cell (x, y) lives at x * size + y: 0 empty, 1 black, 2 white
+        self.grid = bytearray(size * size)
         self.moves: List[Position] = []
+        self.stone_count = 0
+        self._str_cache: Optional[str] = None
+        self.zobrist = _zobrist_table(size)
+        self.hash = 0
+
+        # Bitboards: bit x * stride + y. The extra column at y == size is always
+        # empty, so shifted runs stop there instead of wrapping onto the next row.
+        self.stride = size + 1
+        self.full_mask = sum(((1 << size) - 1) << (x * self.stride) for x in range(size))
+        self.black = 0
+        self.white = 0
+        self.occ = 0
+        # (dx, dy) -> bit shift for one step in that direction
+        self.shifts = {
+            (1, 0): self.stride,
+            (0, 1): 1,
+            (1, 1): self.stride + 1,
+            (1, -1): self.stride - 1,
+        }
+        self.neighbor_mask = _neighbor_masks(size, 2)
+        # Cells within radius 2 of any stone, grown on each move; undo pops the old value
+        self.near = 0
+        self._near_stack: List[int] = []
+
+        # Every row, column and diagonal as its own byte string (0 empty, 1 black,
+        # 2 white) with its (black, white) pattern score. Each move rescores the four
+        # lines through its cell and patches the totals, so evaluation is two reads.
+        # `line_codes` holds each line read as a base-3 number with a leading 1 digit
+        # for its length; it is patched in O(1) per move and keys the score table.
+        lengths, self.cell_lines = _line_layout(size)
+        self.lines: Dict[LineKey, bytearray] = {key: bytearray(n) for key, n in lengths.items()}
+        self.line_codes: Dict[LineKey, int] = {key: 3**n for key, n in lengths.items()}
+        self.line_scores: Dict[LineKey, Tuple[int, int]] = dict.fromkeys(self.lines, (0, 0))
+        self.score_black = 0
+        self.score_white = 0
 
     def clone(self) -> "Board":
-        new_board = Board(self.size)
-        new_board.grid = [row[:] for row in self.grid]
+        new_board = type(self)(self.size)
+        new_board.grid = self.grid[:]
         new_board.moves = self.moves[:]
+        new_board.stone_count = self.stone_count
+        new_board.hash = self.hash
+        new_board.black = self.black
+        new_board.white = self.white
+        new_board.occ = self.occ
+        new_board.near = self.near
+        new_board._near_stack = self._near_stack[:]
+        new_board.lines = {key: line[:] for key, line in self.lines.items()}
+        new_board.line_codes = dict(self.line_codes)
+        new_board.line_scores = dict(self.line_scores)
+        new_board.score_black = self.score_black
+        new_board.score_white = self.score_white
         return new_board
 
     def in_bounds(self, pos: Position) -> bool:
@@ -25,27 +176,96 @@ class Board:
 
     def is_empty(self, pos: Position) -> bool:
         x, y = pos
-        return self.grid[x][y] == 0
+        return self.grid[x * self.size + y] == 0
 
     def place_move(self, pos: Position, player: int) -> bool:
         if not self.in_bounds(pos) or not self.is_empty(pos):
             return False
         x, y = pos
-        self.grid[x][y] = player
+        code = 1 if player == 1 else 2
+        self.grid[x * self.size + y] = code
         self.moves.append(pos)
+        self.stone_count += 1
+        self._str_cache = None
+        self.hash ^= self.zobrist[x][y][0 if player == 1 else 1]
+        bit = 1 << (x * self.stride + y)
+        self.occ |= bit
+        if player == 1:
+            self.black |= bit
+        else:
+            self.white |= bit
+        self._near_stack.append(self.near)
+        self.near |= self.neighbor_mask[x * self.size + y]
+        self._update_lines(x, y, code)
+        return True
+
+    def place_moves(self, moves: List[Tuple[Position, int]]) -> bool:
+        """
+        Place a sequence of (pos, player) moves in order. Stops at the first illegal
+        move and returns False, leaving the moves before it on the board.
+        """
+        place = self.place_move
+        for pos, player in moves:
+            if not place(pos, player):
+                return False
         return True
 
     def undo_move(self) -> None:
         if not self.moves:
             return
         x, y = self.moves.pop()
-        self.grid[x][y] = 0
+        self.stone_count -= 1
+        self._str_cache = None
+        bit = 1 << (x * self.stride + y)
+        self.occ ^= bit
+        if self.grid[x * self.size + y] == 1:
+            self.hash ^= self.zobrist[x][y][0]
+            self.black ^= bit
+        else:
+            self.hash ^= self.zobrist[x][y][1]
+            self.white ^= bit
+        self.near = self._near_stack.pop()
+        self.grid[x * self.size + y] = 0
+        self._update_lines(x, y, 0)
+
+    def _update_lines(self, x: int, y: int, code: int) -> None:
+        lines, line_codes, line_scores = self.lines, self.line_codes, self.line_scores
+        black, white = self.score_black, self.score_white
+        for key, idx, weight in self.cell_lines[x][y]:
+            line = lines[key]
+            line_code = line_codes[key] + (code - line[idx]) * weight
+            line_codes[key] = line_code
+            line[idx] = code
+            old_black, old_white = line_scores[key]
+            new_black, new_white = line_scores[key] = score_line(line, line_code)
+            black += new_black - old_black
+            white += new_white - old_white
+        self.score_black, self.score_white = black, white
+
+    def scores_after(self, pos: Position, player: int) -> Tuple[int, int]:
+        """
+        (score_black, score_white) as they would be after `player` plays the empty cell
+        `pos`, without making the move. Only the four lines through `pos` are rescored.
+        """
+        x, y = pos
+        code = 1 if player == 1 else 2
+        lines, line_codes, line_scores = self.lines, self.line_codes, self.line_scores
+        black, white = self.score_black, self.score_white
+        for key, idx, weight in self.cell_lines[x][y]:
+            line = lines[key]
+            line[idx] = code
+            new_black, new_white = score_line(line, line_codes[key] + code * weight)
+            line[idx] = 0
+            old_black, old_white = line_scores[key]
+            black += new_black - old_black
+            white += new_white - old_white
+        return black, white
 
     def last_move(self) -> Optional[Position]:
         return self.moves[-1] if self.moves else None
 
     def is_full(self) -> bool:
-        return all(cell != 0 for row in self.grid for cell in row)
+        return self.stone_count >= self.size * self.size
 
     def get_winner(self) -> Optional[int]:
         result = self.get_winner_line()
@@ -56,35 +276,67 @@ class Board:
         if not self.moves:
             return None
         x, y = self.moves[-1]
-        player = self.grid[x][y]
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-        for dx, dy in directions:
+        player = 1 if self.grid[x * self.size + y] == 1 else -1
+        bb = self.black if player == 1 else self.white
+        for (dx, dy), s in self.shifts.items():
+            # Each AND keeps only bits that start a longer run: 2, 4, then 5 in a row
+            run = bb & (bb >> s)
+            run &= run >> (2 * s)
+            run &= run >> s
+            if not run:
+                continue
             line = [(x, y)]
             line = self._collect_dir(x, y, dx, dy, player, line)
             line = self._collect_dir(x, y, -dx, -dy, player, line)
             if len(line) >= 5:
+                line.sort()
+                return player, line
+        return None
 
+    def check_win_at(self, pos: Position, player: int) -> Optional[Tuple[int, List[Position]]]:
+        """
+        (player, line) if the stone of `player` at `pos` is part of five or more in a
+        row, else None. Only the four lines through `pos` are walked.
+        """
+        x, y = pos
+        code = 1 if player == 1 else 2
+        if self.grid[x * self.size + y] != code:
+            return None
+        for dx, dy in self.shifts:
+            line = self._collect_dir(x, y, dx, dy, player, [(x, y)])
+            line = self._collect_dir(x, y, -dx, -dy, player, line)
+            if len(line) >= 5:
                 line.sort()
                 return player, line
         return None
 
     def _count_dir(self, x: int, y: int, dx: int, dy: int, player: int) -> int:
+        size, grid = self.size, self.grid
+        code = 1 if player == 1 else 2
+        step = dx * size + dy
         count = 0
         nx, ny = x + dx, y + dy
-        while 0 <= nx < self.size and 0 <= ny < self.size and self.grid[nx][ny] == player:
+        off = nx * size + ny
+        while 0 <= nx < size and 0 <= ny < size and grid[off] == code:
             count += 1
             nx += dx
             ny += dy
+            off += step
         return count
 
     def _collect_dir(
         self, x: int, y: int, dx: int, dy: int, player: int, acc: List[Position]
     ) -> List[Position]:
+        size, grid = self.size, self.grid
+        code = 1 if player == 1 else 2
+        step = dx * size + dy
         nx, ny = x + dx, y + dy
-        while 0 <= nx < self.size and 0 <= ny < self.size and self.grid[nx][ny] == player:
+        off = nx * size + ny
+        while 0 <= nx < size and 0 <= ny < size and grid[off] == code:
             acc.append((nx, ny))
             nx += dx
             ny += dy
+            off += step
         return acc
 
     def generate_moves(self, radius: int = 2) -> List[Position]:
@@ -93,43 +345,156 @@ class Board:
             mid = self.size // 2
             return [(mid, mid)]
 
-        xs = [x for x, _ in self.moves]
-        ys = [y for _, y in self.moves]
-        min_x, max_x = max(min(xs) - radius, 0), min(max(xs) + radius, self.size - 1)
-        min_y, max_y = max(min(ys) - radius, 0), min(max(ys) + radius, self.size - 1)
-
-        candidates = []
-        for x in range(min_x, max_x + 1):
-            for y in range(min_y, max_y + 1):
-                if self.grid[x][y] != 0:
-                    continue
-                if self._has_neighbor((x, y), radius):
-                    candidates.append((x, y))
-        return candidates
-
-    def _has_neighbor(self, pos: Position, radius: int) -> bool:
-        px, py = pos
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                if dx == 0 and dy == 0:
-                    continue
-                nx, ny = px + dx, py + dy
-                if 0 <= nx < self.size and 0 <= ny < self.size and self.grid[nx][ny] != 0:
-                    return True
-        return False
+        stride = self.stride
+        if radius == 2:
+            near = self.near
+        else:
+            # Grow the occupied cells by one step per iteration, first along rows and then
+            # along columns; masking after every shift drops bits pushed off the board.
+            full = self.full_mask
+            near = self.occ
+            for _ in range(radius):
+                near = (near | near << 1 | near >> 1) & full
+                near = (near | near << stride | near >> stride) & full
+        return self._mask_positions(near & ~self.occ)
+
+    def find_immediate_threats(self, player: int) -> List[Position]:
+        """
+        Empty cells where `player` would complete five (or more) in a row.
+        """
+        bb = self.black if player == 1 else self.white
+        empty = self.full_mask & ~self.occ
+        threats = 0
+        for s in self.shifts.values():
+            # Each window of five cells starting at a bit: four stones plus one gap
+            a = [bb >> (k * s) for k in range(5)]
+            e = [empty >> (k * s) for k in range(5)]
+            threats |= e[0] & a[1] & a[2] & a[3] & a[4]
+            threats |= (a[0] & e[1] & a[2] & a[3] & a[4]) << s
+            threats |= (a[0] & a[1] & e[2] & a[3] & a[4]) << (2 * s)
+            threats |= (a[0] & a[1] & a[2] & e[3] & a[4]) << (3 * s)
+            threats |= (a[0] & a[1] & a[2] & a[3] & e[4]) << (4 * s)
+        return self._mask_positions(threats)
+
+    def find_four_moves(self, player: int) -> List[Position]:
+        """
+        Empty cells where `player` would make a four: four stones in a five-cell window
+        whose last cell is still empty, so the move threatens five next turn.
+        """
+        bb = self.black if player == 1 else self.white
+        empty = self.full_mask & ~self.occ
+        cells = 0
+        for s in self.shifts.values():
+            a = [bb >> (k * s) for k in range(5)]
+            e = [empty >> (k * s) for k in range(5)]
+            for i, j, (k1, k2, k3) in _FOUR_WINDOWS:
+                window = e[i] & e[j] & a[k1] & a[k2] & a[k3]
+                if window:
+                    cells |= (window << (i * s)) | (window << (j * s))
+        return self._mask_positions(cells)
+
+    def _mask_positions(self, mask: int) -> List[Position]:
+        # Walk the mask one row at a time so the per-bit work stays on small ints
+        positions = []
+        row_mask = (1 << self.size) - 1
+        x = 0
+        while mask:
+            row = mask & row_mask
+            while row:
+                lsb = row & -row
+                positions.append((x, lsb.bit_length() - 1))
+                row ^= lsb
+            mask >>= self.stride
+            x += 1
+        return positions
 
     def __str__(self) -> str:
+        if self._str_cache is not None:
+            return self._str_cache
         header = "   " + " ".join(f"{i:2}" for i in range(self.size))
         rows = []
-        for i, row in enumerate(self.grid):
+        for i in range(self.size):
             symbols = []
-            for cell in row:
+            for cell in self.grid[i * self.size : (i + 1) * self.size]:
                 if cell == 1:
                     symbols.append("X ")
-                elif cell == -1:
+                elif cell == 2:
                     symbols.append("O ")
                 else:
                     symbols.append(". ")
             rows.append(f"{i:2} " + "".join(symbols))
-        return "\n".join([header] + rows)
+        self._str_cache = "\n".join([header] + rows)
+        return self._str_cache
+
+
+class Board15(Board):
+    """
+    Board for the standard 15x15 game with the size folded into the small hot
+    methods: the bounds, emptiness and fullness checks use literals instead of
+    attribute loads, and the winner check is unrolled over the four directions
+    (bitboard stride 16). Move bookkeeping is inherited unchanged from Board.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, size: int = 15):
+        if size != 15:
+            raise ValueError("Board15 only supports size 15")
+        super().__init__(15)
+
+    def in_bounds(self, pos: Position) -> bool:
+        x, y = pos
+        return 0 <= x < 15 and 0 <= y < 15
+
+    def is_empty(self, pos: Position) -> bool:
+        x, y = pos
+        return self.grid[x * 15 + y] == 0
+
+    def is_full(self) -> bool:
+        return self.stone_count >= 225
+
+    def get_winner_line(self) -> Optional[Tuple[int, List[Position]]]:
+        if not self.moves:
+            return None
+        x, y = self.moves[-1]
+        player = 1 if self.grid[x * 15 + y] == 1 else -1
+        bb = self.black if player == 1 else self.white
+        # Same run test as Board.get_winner_line, directions in the same order
+        run = bb & (bb >> 16)
+        run &= run >> 32
+        if run & (run >> 16):
+            line = self._winner_from(x, y, 1, 0, player)
+            if line:
+                return player, line
+        run = bb & (bb >> 1)
+        run &= run >> 2
+        if run & (run >> 1):
+            line = self._winner_from(x, y, 0, 1, player)
+            if line:
+                return player, line
+        run = bb & (bb >> 17)
+        run &= run >> 34
+        if run & (run >> 17):
+            line = self._winner_from(x, y, 1, 1, player)
+            if line:
+                return player, line
+        run = bb & (bb >> 15)
+        run &= run >> 30
+        if run & (run >> 15):
+            line = self._winner_from(x, y, 1, -1, player)
+            if line:
+                return player, line
+        return None
+
+    def _winner_from(self, x: int, y: int, dx: int, dy: int, player: int) -> List[Position]:
+        line = self._collect_dir(x, y, dx, dy, player, [(x, y)])
+        line = self._collect_dir(x, y, -dx, -dy, player, line)
+        if len(line) >= 5:
+            line.sort()
+            return line
+        return []
+
 
+def new_board(size: int = 15) -> Board:
+    """Board of the given size, using the specialised Board15 for the standard size."""
+    return Board15() if size == 15 else Board(size)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+import multiprocessing
 from typing import Optional, Tuple
 
 from .board import Board, Position
@@ -8,13 +9,21 @@ from .search import SearchResult, iterative_deepening
 
 
 class Engine:
-    def __init__(self, max_depth: int = 4, time_limit: float = 2.0):
+    def __init__(self, max_depth: int = 4, time_limit: float = 2.0, workers: int = 1):
         self.max_depth = max_depth
         self.time_limit = time_limit
+        self.workers = workers
+        # Worker processes for the root search, started once and reused for every move
+        self._pool = multiprocessing.Pool(workers) if workers > 1 else None
 
     def choose_move(self, board: Board, player: int) -> Position:
         result: SearchResult = iterative_deepening(
-            board, player, max_depth=self.max_depth, time_limit=self.time_limit
+            board,
+            player,
+            max_depth=self.max_depth,
+            time_limit=self.time_limit,
+            pool=self._pool,
+            workers=self.workers,
         )
         if result.move is None:
             # Fallback: first available
@@ -24,9 +33,24 @@ class Engine:
             return moves[0]
         return result.move
 
-    def set_limits(self, max_depth: Optional[int] = None, time_limit: Optional[float] = None):
+    def set_limits(
+        self,
+        max_depth: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        workers: Optional[int] = None,
+    ):
         if max_depth is not None:
             self.max_depth = max_depth
         if time_limit is not None:
             self.time_limit = time_limit
+        if workers is not None and workers != self.workers:
+            self.close()
+            self.workers = workers
+            self._pool = multiprocessing.Pool(workers) if workers > 1 else None
+
+    def close(self):
+        """Stop the worker processes, if any."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
 
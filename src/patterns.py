@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Tuple
+
+PATTERN_SCORES = {
+    "11111": 100000,
+    "011110": 10000,  # open four
+    "211110": 5000,
+    "111102": 5000,
+    "10111": 5000,
+    "11011": 5000,
+    "11101": 5000,
+    "011100": 1000,
+    "001110": 1000,
+    "011010": 1000,
+    "010110": 1000,
+    "001112": 200,
+    "010112": 200,
+    "011012": 200,
+    "211100": 200,
+    "211010": 200,
+    "210110": 200,
+    "00110": 50,
+    "01100": 50,
+    "01010": 50,
+    "010010": 50,
+}
+
+
+def _pattern_trie(patterns: Iterable[str]) -> str:
+    # Merge the patterns into one regex with shared prefixes, e.g. "1(?:0111|1(?:011|...))",
+    # so the engine follows a single branch per character like an Aho-Corasick automaton.
+    # No pattern is a prefix of another, so every leaf ends exactly one pattern.
+    trie: Dict[str, dict] = {}
+    for pattern in patterns:
+        node = trie
+        for ch in pattern:
+            node = node.setdefault(ch, {})
+
+    def emit(node: Dict[str, dict]) -> str:
+        alts = [ch + emit(child) for ch, child in sorted(node.items())]
+        if len(alts) <= 1:
+            return "".join(alts)
+        return "(?:" + "|".join(alts) + ")"
+
+    return emit(trie)
+
+
+# Lines are matched as bytes, so the patterns are pre-encoded once here.
+PATTERN_SCORES_B: Dict[bytes, int] = {p.encode("ascii"): v for p, v in PATTERN_SCORES.items()}
+
+# The lookahead makes matches zero-width, so overlapping occurrences are all reported
+# in one left-to-right pass, the same as repeated str.find calls from idx + 1.
+_PATTERN_RE = re.compile(("(?=(" + _pattern_trie(PATTERN_SCORES) + "))").encode("ascii"))
+
+# Board line codes (0 empty, 1 black, 2 white) -> pattern alphabet (1 own stone,
+# 2 opponent stone, 0 empty) as seen by black and by white
+_BLACK_VIEW = bytes.maketrans(b"\x00\x01\x02", b"012")
+_WHITE_VIEW = bytes.maketrans(b"\x00\x01\x02", b"021")
+
+
+# Line code -> (black score, white score). Searches keep revisiting the same few
+# thousand line states, so most rescoring is a dict hit; the cap bounds memory.
+_LINE_SCORE_CACHE: Dict[int, Tuple[int, int]] = {}
+_LINE_SCORE_CACHE_MAX = 200_000
+
+
+def score_line(line: bytearray, code: int) -> Tuple[int, int]:
+    """
+    Pattern score of one board line (cell codes 0 empty, 1 black, 2 white),
+    returned as (black score, white score). `code` must identify the line's contents
+    uniquely, e.g. the base-3 code the board maintains; it keys the score table.
+    """
+    scores = _LINE_SCORE_CACHE.get(code)
+    if scores is None:
+        findall = _PATTERN_RE.findall
+        pattern_score = PATTERN_SCORES_B.__getitem__
+        black = sum(map(pattern_score, findall(line.translate(_BLACK_VIEW))))
+        white = sum(map(pattern_score, findall(line.translate(_WHITE_VIEW))))
+        scores = (black, white)
+        if len(_LINE_SCORE_CACHE) >= _LINE_SCORE_CACHE_MAX:
+            _LINE_SCORE_CACHE.clear()
+        _LINE_SCORE_CACHE[code] = scores
+    return scores
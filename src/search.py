@@ -1,11 +1,48 @@
 from __future__ import annotations
 
-import math
+import heapq
+import multiprocessing
 import time
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from .board import Board, Position
-from .evaluation import evaluate
+from .evaluation import evaluate, evaluate_scores
+
+# Score of a won position; also bounds the full alpha-beta window. Plain ints keep
+# every comparison in the search on the int fast path instead of mixing in float inf.
+INF = 10_000_000
+
+# Half-width of the aspiration window. Pattern scores step in hundreds to thousands,
+# so narrower windows fail and re-search on almost every iteration.
+ASPIRATION_DELTA = 1500
+
+# Below the root only the best max(MIN_BRANCH, BRANCH_PER_DEPTH * depth) moves by
+# evaluation after playing them are searched, plus any move that makes or blocks a four
+MIN_BRANCH = 10
+BRANCH_PER_DEPTH = 5
+
+# Transposition table flags: the stored value is exact, a lower bound or an upper bound
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Zobrist hash -> (depth, value, flag, best_move)
+TT: Dict[int, Tuple[int, int, int, Optional[Position]]] = {}
+
+# Up to two quiet moves per ply that recently caused a cutoff, and a cutoff
+# count per square weighted by depth; both only steer move ordering
+killers: List[List[Position]] = []
+history: Dict[Position, int] = {}
+
+# Nodes visited in the current search; the clock is only read every 1024 nodes
+_node_counter = [0]
+
+# Searches started in this process, and in a pool worker the search its tables
+# belong to; a worker clears its tables when handed a root chunk of a new search
+_search_count = [0]
+_worker_search = [0]
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search once the deadline has passed."""
 
 
 class SearchResult:
@@ -15,95 +52,285 @@ class SearchResult:
         self.depth = depth
 
 
-def minimax(
+def negamax(
     board: Board,
     depth: int,
     alpha: int,
     beta: int,
-    maximizing: bool,
+    color: int,
     player: int,
-    start_time: float,
-    time_limit: float,
+    deadline_ns: int,
+    ply: int = 0,
 ) -> Tuple[int, Optional[Position]]:
     """
-    Depth-limited minimax search with alpha-beta pruning.
-    Returns (score, best_move).
+    Depth-limited negamax search with alpha-beta pruning, principal variation search
+    and a transposition table. `color` is +1 when `player` is to move and -1 otherwise.
+    Returns (score, best_move) with the score from the side to move's point of view.
+    Raises _SearchTimeout once `deadline_ns` (time.monotonic_ns) has passed, leaving
+    the caller to undo the moves still on the board.
     """
+    _node_counter[0] += 1
+    if (_node_counter[0] & 0x3FF) == 0 and time.monotonic_ns() > deadline_ns:
+        raise _SearchTimeout
+    side = color * player
     winner = board.get_winner()
     if winner is not None:
-        return (math.inf if winner == player else -math.inf, None)
+        return (INF if winner == side else -INF, None)
+
+    if depth == 0 or board.is_full():
+        return color * evaluate(board, player), None
+
+    tt_move: Optional[Position] = None
+    entry = TT.get(board.hash)
+    if entry is not None:
+        tt_depth, tt_value, tt_flag, tt_move = entry
+        if tt_depth >= depth:
+            if tt_flag == EXACT:
+                return tt_value, tt_move
+            if tt_flag == LOWER:
+                alpha = max(alpha, tt_value)
+            else:
+                beta = min(beta, tt_value)
+            if beta <= alpha:
+                return tt_value, tt_move
+    alpha_orig = alpha
 
-    if depth == 0 or board.is_full() or time.time() - start_time >= time_limit:
-        return evaluate(board, player), None
+    # Tactical shortcuts: a five on the next move wins outright, and an opponent five
+    # on the next move must be blocked, so no other move is worth searching
+    wins = board.find_immediate_threats(side)
+    if wins:
+        return INF, wins[0]
+    moves = board.find_immediate_threats(-side) or _order_moves(
+        board, player, ply, tt_move, depth, color
+    )
 
     best_move: Optional[Position] = None
-    moves = _order_moves(board, player if maximizing else -player)
+    value = -INF
+    first = True
+    for move in moves:
+        if not board.place_move(move, side):
+            continue
+        if first:
+            score = -negamax(
+                board, depth - 1, -beta, -alpha, -color, player, deadline_ns, ply + 1
+            )[0]
+            first = False
+        else:
+            # Later moves only need to prove they are no better than alpha; search them
+            # with a null window and re-search with the full window when one is.
+            score = -negamax(
+                board, depth - 1, -alpha - 1, -alpha, -color, player, deadline_ns, ply + 1
+            )[0]
+            if alpha < score < beta:
+                score = -negamax(
+                    board, depth - 1, -beta, -alpha, -color, player, deadline_ns, ply + 1
+                )[0]
+        board.undo_move()
+        if score > value:
+            value = score
+            best_move = move
+        alpha = max(alpha, value)
+        if alpha >= beta:
+            _record_cutoff(move, depth, ply)
+            break
 
-    if maximizing:
-        value = -math.inf
-        for move in moves:
-            if not board.place_move(move, player):
-                continue
-            score, _ = minimax(board, depth - 1, alpha, beta, False, player, start_time, time_limit)
-            board.undo_move()
-            if score > value:
-                value = score
-                best_move = move
-            alpha = max(alpha, value)
-            if beta <= alpha or time.time() - start_time >= time_limit:
-                break
-        return value, best_move
+    if value <= alpha_orig:
+        flag = UPPER
+    elif value >= beta:
+        flag = LOWER
     else:
-        value = math.inf
-        opp = -player
-        for move in moves:
-            if not board.place_move(move, opp):
-                continue
-            score, _ = minimax(board, depth - 1, alpha, beta, True, player, start_time, time_limit)
-            board.undo_move()
-            if score < value:
-                value = score
-                best_move = move
-            beta = min(beta, value)
-            if beta <= alpha or time.time() - start_time >= time_limit:
-                break
-        return value, best_move
+        flag = EXACT
+    TT[board.hash] = (depth, value, flag, best_move)
+    return value, best_move
 
 
 def iterative_deepening(
-    board: Board, player: int, max_depth: int = 4, time_limit: float = 2.0
+    board: Board,
+    player: int,
+    max_depth: int = 4,
+    time_limit: float = 2.0,
+    pool: Optional[multiprocessing.pool.Pool] = None,
+    workers: int = 1,
 ) -> SearchResult:
     """
-    Iterative deepening wrapper that keeps the best result found within time.
+    Iterative deepening wrapper that keeps the result of the deepest search completed
+    within time. With a `pool` of `workers` processes (workers > 1) the root moves of
+    every iteration are split across them; the caller owns the pool so it can be
+    reused from move to move.
     """
-    start = time.time()
-    best = SearchResult(move=None, value=-math.inf, depth=0)
+    deadline_ns = time.monotonic_ns() + int(time_limit * 1e9)
+    _node_counter[0] = 0
+    _search_count[0] += 1
+    # Scores are relative to `player`, so entries from a previous search cannot be reused
+    TT.clear()
+    killers.clear()
+    history.clear()
+    if workers <= 1:
+        pool = None
+    return _deepen(board, player, max_depth, deadline_ns, pool, workers)
+
+
+def _deepen(
+    board: Board,
+    player: int,
+    max_depth: int,
+    deadline_ns: int,
+    pool: Optional[multiprocessing.pool.Pool],
+    workers: int,
+) -> SearchResult:
+    best = SearchResult(move=None, value=-INF, depth=0)
+    scores: Dict[int, int] = {}
     for depth in range(1, max_depth + 1):
-        remaining = time_limit - (time.time() - start)
-        if remaining <= 0:
+        if time.monotonic_ns() >= deadline_ns:
+            break
+        base = len(board.moves)
+        try:
+            if pool is not None:
+                value, move = _parallel_root(
+                    pool, workers, board, depth, player, deadline_ns, best.move
+                )
+            else:
+                value, move = _aspiration_root(board, depth, player, deadline_ns, scores)
+        except _SearchTimeout:
+            while len(board.moves) > base:
+                board.undo_move()
             break
-        value, move = minimax(
-            board, depth, -math.inf, math.inf, True, player, start, time_limit
-        )
+        scores[depth] = value
         if move is not None:
             best = SearchResult(move=move, value=value, depth=depth)
         # Early exit on winning line
-        if value == math.inf:
+        if value >= INF:
             break
     return best
 
 
-def _order_moves(board: Board, player: int) -> List[Position]:
-    """
-    Order moves by a shallow heuristic to improve pruning.
-    """
-    candidates = board.generate_moves(radius=2)
-    scored = []
-    for move in candidates:
-        if board.place_move(move, player):
-            score = evaluate(board, player)
+def _aspiration_root(
+    board: Board, depth: int, player: int, deadline_ns: int, scores: Dict[int, int]
+) -> Tuple[int, Optional[Position]]:
+    # Search a narrow window around the score from two plies shallower (scores swing
+    # between odd and even depths); widen the failing side to the full range and
+    # search again if the result falls outside it
+    if depth >= 3:
+        guess = scores[depth - 2]
+        alpha, beta = guess - ASPIRATION_DELTA, guess + ASPIRATION_DELTA
+    else:
+        alpha, beta = -INF, INF
+    while True:
+        value, move = negamax(board, depth, alpha, beta, 1, player, deadline_ns)
+        if value <= alpha and alpha > -INF:
+            alpha = -INF
+        elif value >= beta and beta < INF:
+            beta = INF
+        else:
+            return value, move
+
+
+def _parallel_root(
+    pool: multiprocessing.pool.Pool,
+    workers: int,
+    board: Board,
+    depth: int,
+    player: int,
+    deadline_ns: int,
+    hint: Optional[Position],
+) -> Tuple[int, Optional[Position]]:
+    # Same root tactics as negamax, then deal the ordered root moves round-robin so
+    # every worker gets a share of the promising ones
+    wins = board.find_immediate_threats(player)
+    if wins:
+        return INF, wins[0]
+    moves = board.find_immediate_threats(-player) or _order_moves(board, player, 0, hint)
+    chunks = [moves[i::workers] for i in range(workers)]
+    search_id = _search_count[0]
+    tasks = [(board, chunk, depth, player, deadline_ns, search_id) for chunk in chunks if chunk]
+    value, best_move = -INF, None
+    for result in pool.map(_search_root_chunk, tasks):
+        if result is None:
+            raise _SearchTimeout
+        score, move = result
+        if move is not None and (best_move is None or score > value):
+            value, best_move = score, move
+    return value, best_move
+
+
+def _search_root_chunk(
+    task: Tuple[Board, List[Position], int, int, int, int]
+) -> Optional[Tuple[int, Optional[Position]]]:
+    # Runs in a worker process on its own copy of the board; None means out of time.
+    # The worker's tables carry over between the iterations of one search only.
+    board, moves, depth, player, deadline_ns, search_id = task
+    if _worker_search[0] != search_id:
+        _worker_search[0] = search_id
+        TT.clear()
+        killers.clear()
+        history.clear()
+    value, best_move = -INF, None
+    try:
+        for move in moves:
+            board.place_move(move, player)
+            score = -negamax(board, depth - 1, -INF, -value, -1, player, deadline_ns, 1)[0]
             board.undo_move()
-            scored.append((score, move))
-    scored.sort(reverse=True, key=lambda x: x[0])
-    return [m for _, m in scored]
+            if best_move is None or score > value:
+                value, best_move = score, move
+            if value >= INF:
+                break
+    except _SearchTimeout:
+        return None
+    return value, best_move
+
 
+def _record_cutoff(move: Position, depth: int, ply: int) -> None:
+    while len(killers) <= ply:
+        killers.append([])
+    slot = killers[ply]
+    if move not in slot:
+        slot.insert(0, move)
+        del slot[2:]
+    history[move] = history.get(move, 0) + depth * depth
+
+
+def _order_moves(
+    board: Board,
+    player: int,
+    ply: int = 0,
+    tt_move: Optional[Position] = None,
+    depth: int = 0,
+    color: int = 1,
+) -> List[Position]:
+    """
+    Order the moves of the side to move (`color` * `player`) to improve pruning: the
+    transposition-table move first, then killer moves for this ply, then the rest by
+    the evaluation right after playing them (which rewards making and blocking threats
+    alike, and is exactly what a depth-1 search would find), with history breaking
+    ties. The root keeps every candidate; deeper nodes keep the best
+    max(MIN_BRANCH, BRANCH_PER_DEPTH * depth) by evaluation plus every four-making and
+    four-blocking move. None of that depends on the ordering tables, so the searched
+    tree does not either and parallel searches see the same moves.
+    """
+    side = color * player
+    scores_after = board.scores_after
+    scored = [
+        (color * evaluate_scores(*scores_after(move, side), player), move)
+        for move in board.generate_moves(radius=2)
+    ]
+    if ply > 0:
+        # nlargest is stable, so equal scores keep their board order. Moves that make
+        # a four, or take the cell the opponent would make one on, are kept whatever
+        # they score: the pattern table can undervalue a forcing four.
+        limit = max(MIN_BRANCH, BRANCH_PER_DEPTH * depth)
+        forcing = set(board.find_four_moves(side))
+        forcing.update(board.find_four_moves(-side))
+        kept = heapq.nlargest(limit, scored, key=lambda x: x[0])
+        forcing.difference_update(m for _, m in kept)
+        scored = kept + [sm for sm in scored if sm[1] in forcing]
+    scored.sort(key=lambda x: (x[0], history.get(x[1], 0)), reverse=True)
+    ordered = [m for _, m in scored]
+    if 0 < ply < len(killers):
+        for killer in reversed(killers[ply]):
+            if killer in ordered:
+                ordered.remove(killer)
+                ordered.insert(0, killer)
+    if tt_move is not None and tt_move in ordered:
+        ordered.remove(tt_move)
+        ordered.insert(0, tt_move)
+    return ordered
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import argparse
 
-from .board import Board
+from .board import new_board
 from .engine import Engine
 
 
@@ -16,14 +16,28 @@ def parse_move(inp: str, size: int):
     return x, y
 
 
-def play_cli(size: int = 15, max_depth: int = 4, time_limit: float = 2.0):
-    board = Board(size=size)
-    engine = Engine(max_depth=max_depth, time_limit=time_limit)
+def play_cli(
+    size: int = 15,
+    max_depth: int = 4,
+    time_limit: float = 2.0,
+    quiet: bool = False,
+    workers: int = 1,
+):
+    engine = Engine(max_depth=max_depth, time_limit=time_limit, workers=workers)
+    try:
+        _play(engine, size, quiet)
+    finally:
+        engine.close()
+
+
+def _play(engine: Engine, size: int, quiet: bool):
+    board = new_board(size)
     current_player = 1  # 1 = human (black), -1 = AI
 
     print("Gomoku CLI - you are X (black). Input as: row col")
     while True:
-        print(board)
+        if not quiet:
+            print(board)
         winner = board.get_winner()
         if winner is not None:
             print("You win!" if winner == 1 else "AI wins!")
@@ -43,7 +57,8 @@ def play_cli(size: int = 15, max_depth: int = 4, time_limit: float = 2.0):
                 print(f"Error: {exc}")
                 continue
         else:
-            print("AI thinking...")
+            if not quiet:
+                print("AI thinking...")
             move = engine.choose_move(board, current_player)
             board.place_move(move, current_player)
             print(f"AI plays: {move[0]} {move[1]}")
@@ -56,9 +71,21 @@ def main():
     parser.add_argument("--size", type=int, default=15, help="Board size (default 15)")
     parser.add_argument("--depth", type=int, default=4, help="Max search depth")
     parser.add_argument("--time", type=float, default=2.0, help="Time limit per move (seconds)")
+    parser.add_argument(
+        "--quiet", action="store_true", help="Do not print the board or AI status each turn"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Processes for the AI search (default 1)"
+    )
     args = parser.parse_args()
 
-    play_cli(size=args.size, max_depth=args.depth, time_limit=args.time)
+    play_cli(
+        size=args.size,
+        max_depth=args.depth,
+        time_limit=args.time,
+        quiet=args.quiet,
+        workers=args.workers,
+    )
 
 
 if __name__ == "__main__":
@@ -1,18 +1,12 @@
 from __future__ import annotations
 
 import argparse
+import threading
 import tkinter as tk
 from typing import Optional
 import os
 
-try:
-    import pygame
-    _PYGAME_AVAILABLE = True
-except Exception:
-    pygame = None
-    _PYGAME_AVAILABLE = False
-
-from .board import Board
+from .board import new_board
 from .engine import Engine
 
 
@@ -25,10 +19,12 @@ class GomokuGUI:
         time_limit: float = 2.0,
         simulate: bool = False,
         move_delay: int = 450,
+        workers: int = 1,
     ):
         self.size = size
-        self.board = Board(size=size)
-        self.engine = Engine(max_depth=max_depth, time_limit=time_limit)
+        self.board = new_board(size)
+        # Created before Tk so search worker processes do not inherit the Tk state
+        self.engine = Engine(max_depth=max_depth, time_limit=time_limit, workers=workers)
         self.current_player = 1  # 1 black, -1 white
         self.simulate = simulate
         self.move_delay = move_delay
@@ -43,11 +39,18 @@ class GomokuGUI:
         self.window.bind("<Escape>", self._exit_fullscreen)
         default_status = "Simulation: black vs white" if simulate else "Turn: Human"
         self.status = tk.StringVar(value=default_status)
+        # Text currently in the status bar, text waiting for the next idle flush,
+        # and the scheduled flush
+        self._shown_status = default_status
+        self._pending_status: Optional[str] = None
+        self._status_after: Optional[str] = None
+        # Stones placed since the last idle flush, and the scheduled flush
+        self._pending_stones: list = []
+        self._stones_after: Optional[str] = None
 
         # sound support (optional)
         self._sounds = {}
-        self._pygame = pygame if _PYGAME_AVAILABLE else None
-        self._init_sounds()
+        self._pygame = None
 
         # Fit the board to the screen while keeping generous cell size
         self.window.update_idletasks()
@@ -57,10 +60,27 @@ class GomokuGUI:
         self.cell = max(int(max_board_px / self.size), cell, 24)
         self.margin = self.cell // 2
         board_px = self.margin * 2 + (self.size - 1) * self.cell
+        # Canvas centre of every board cell, indexed [x][y]
+        self._px = [
+            [(self.margin + y * self.cell, self.margin + x * self.cell) for y in range(self.size)]
+            for x in range(self.size)
+        ]
+        self._stone_radius = self.cell * 0.42
+        self._grid_coords()
+        self._stone_images = {
+            1: self._build_stone_image("black"),
+            -1: self._build_stone_image("white"),
+        }
 
         # Start and game frames
         self.start_frame = tk.Frame(self.window, bg="#1f1f1f")
         self.game_frame = tk.Frame(self.window, bg="#1f1f1f")
+        # Both screens share one grid cell; switching raises one above the other, so
+        # geometry is only propagated once at startup
+        self.window.grid_rowconfigure(0, weight=1)
+        self.window.grid_columnconfigure(0, weight=1)
+        self.start_frame.grid(row=0, column=0, sticky="nsew")
+        self.game_frame.grid(row=0, column=0, sticky="nsew")
 
         # Game UI
         top_bar = tk.Frame(self.game_frame, bg="#1f1f1f")
@@ -96,19 +116,50 @@ class GomokuGUI:
         ).pack()
 
         self._draw_grid()
+        # A single winning-line item, hidden between games and moved into place on a win
+        self._win_line_id = self.canvas.create_line(
+            0,
+            0,
+            0,
+            0,
+            width=self.cell * 0.15,
+            fill="#d62828",
+            capstyle=tk.ROUND,
+            state="hidden",
+            tags=("winline",),
+        )
+        self._win_line_shown = False
         self._build_start_screen()
         self._show_start_screen()
+        # Mixer setup touches the audio device; do it off the UI thread so the window
+        # appears first. Until it finishes, _play_sound falls back to the bell.
+        threading.Thread(target=self._init_sounds, daemon=True).start()
 
-    def _draw_grid(self):
+    def _grid_coords(self):
+        """Compute the grid line and star point coordinates once per board geometry."""
         start = self.margin
         end = self.margin + (self.size - 1) * self.cell
+        # (flat coords, width) per canvas line. Every 5th line is thick and drawn on
+        # its own. The thin rows (and columns) are chained into one serpentine
+        # polyline per axis whose connecting runs lie on the border lines, which are
+        # drawn at least as wide, so each axis costs a single canvas item.
+        self._grid_spec = []
+        rows, cols = [], []
         for i in range(self.size):
             pos = start + i * self.cell
-            width = 3 if i % 5 == 0 else 2
-            self.canvas.create_line(start, pos, end, pos, width=width, fill="#5e3e12")
-            self.canvas.create_line(pos, start, pos, end, width=width, fill="#5e3e12")
-
-        # Star points for standard 15x15 layout
+            if i % 5 == 0:
+                self._grid_spec.append(((start, pos, end, pos), 3))
+                self._grid_spec.append(((pos, start, pos, end), 3))
+                continue
+            a, b = (start, end) if len(rows) % 8 == 0 else (end, start)
+            rows += [a, pos, b, pos]
+            cols += [pos, a, pos, b]
+        if rows:
+            self._grid_spec.append((tuple(rows), 2))
+            self._grid_spec.append((tuple(cols), 2))
+
+        # Star points for standard 15x15 layout, as oval bounding boxes
+        self._star_spec = []
         if self.size >= 11:
             points = [
                 (3, 3),
@@ -117,14 +168,20 @@ class GomokuGUI:
                 (self.size - 4, self.size - 4),
                 (self.size // 2, self.size // 2),
             ]
+            r = self.cell * 0.08
             for px, py in points:
                 cx, cy = self._board_to_canvas((px, py))
-                r = self.cell * 0.08
-                self.canvas.create_oval(cx - r, cy - r, cx + r, cy + r, fill="#5e3e12", outline="")
+                self._star_spec.append((cx - r, cy - r, cx + r, cy + r))
+
+    def _draw_grid(self):
+        for coords, width in self._grid_spec:
+            self.canvas.create_line(*coords, width=width, fill="#5e3e12", tags=("grid",))
+        for coords in self._star_spec:
+            self.canvas.create_oval(*coords, fill="#5e3e12", outline="", tags=("grid",))
 
     def _board_to_canvas(self, pos):
         x, y = pos
-        return self.margin + y * self.cell, self.margin + x * self.cell
+        return self._px[x][y]
 
     def on_click(self, event):
         if self.simulate:
@@ -132,54 +189,88 @@ class GomokuGUI:
         x = event.y // self.cell
         y = event.x // self.cell
         player = self.current_player
-        color = "black" if player == 1 else "white"
         if self.game_mode == "human_ai" and player != 1:
             return
         if not self.board.place_move((x, y), player):
-            self.status.set("Invalid move. Try again.")
+            self._set_status("Invalid move. Try again.")
             return
-        self._draw_stone((x, y), color)
+        self._draw_stone((x, y), player)
         # play move sound
         try:
             self._play_move_sound(player)
         except Exception:
             pass
-        if self._check_end():
+        if self._check_end((x, y), player):
             return
         self.current_player *= -1
         if self.game_mode == "human_ai":
             self._update_turn_status()
-            self.window.after(50, self._ai_move)
+            self.window.after_idle(self._ai_move)
         else:
             self._update_turn_status()
 
     def _ai_move(self):
+        # The search blocks the event loop for up to the time limit, so put the human's
+        # stone on screen first; the one place a synchronous redraw is worth it
+        if self._stones_after is not None:
+            self.window.after_cancel(self._stones_after)
+            self._flush_stones()
+        self.window.update_idletasks()
         move = self.engine.choose_move(self.board, -1)
         self.board.place_move(move, -1)
-        self._draw_stone(move, "white")
+        self._draw_stone(move, -1)
         try:
             self._play_move_sound(-1)
         except Exception:
             pass
-        if self._check_end():
+        if self._check_end(move, -1):
             return
         self.current_player = 1
         self._update_turn_status()
 
-    def _draw_stone(self, pos, color: str):
-        cx, cy = self._board_to_canvas(pos)
-        r = self.cell * 0.42
-        self.canvas.create_oval(cx - r, cy - r, cx + r, cy + r, fill=color, outline="")
-
-    def _check_end(self) -> bool:
-        win_line = self.board.get_winner_line()
+    def _build_stone_image(self, color: str) -> tk.PhotoImage:
+        """Render one stone sprite; a new PhotoImage is transparent until pixels are put."""
+        r = self._stone_radius
+        diameter = int(2 * r) + 1
+        image = tk.PhotoImage(width=diameter, height=diameter)
+        c = (diameter - 1) / 2
+        for row in range(diameter):
+            dy = row - c
+            if dy * dy > r * r:
+                continue
+            half = (r * r - dy * dy) ** 0.5
+            left = max(int(round(c - half)), 0)
+            right = min(int(round(c + half)), diameter - 1)
+            image.put(color, to=(left, row, right + 1, row + 1))
+        return image
+
+    def _draw_stone(self, pos, player: int):
+        # Stones placed within one event-loop turn are drawn together at idle time
+        self._pending_stones.append((pos, player))
+        if self._stones_after is None:
+            self._stones_after = self.window.after_idle(self._flush_stones)
+
+    def _flush_stones(self):
+        self._stones_after = None
+        images = self._stone_images
+        for pos, player in self._pending_stones:
+            cx, cy = self._board_to_canvas(pos)
+            self.canvas.create_image(cx, cy, image=images[player], tags=("stone",))
+        self._pending_stones.clear()
+        if self._win_line_shown:
+            # New stones stack above everything; keep the winning line on top
+            self.canvas.tag_raise(self._win_line_id)
+
+    def _check_end(self, pos, player: int) -> bool:
+        # Only the lines through the move just played can have become a five
+        win_line = self.board.check_win_at(pos, player)
         if win_line is not None:
             player, positions = win_line
             if self.game_mode == "human_ai":
                 message = "You win!" if player == 1 else "AI wins!"
             else:
                 message = "Black wins!" if player == 1 else "White wins!"
-            self.status.set(message)
+            self._set_status(message)
             self._draw_win_line(positions)
             # play end sound (win/lose)
             try:
@@ -196,7 +287,7 @@ class GomokuGUI:
             self._show_end_popup(message)
             return True
         if self.board.is_full():
-            self.status.set("Draw!")
+            self._set_status("Draw!")
             try:
                 self._play_game_end_sound("draw")
             except Exception:
@@ -206,35 +297,33 @@ class GomokuGUI:
         return False
 
     def _draw_win_line(self, positions):
-        positions = sorted(positions)
-        start = positions[0]
-        end = positions[-1]
+        start = min(positions)
+        end = max(positions)
         sx, sy = self._board_to_canvas(start)
         ex, ey = self._board_to_canvas(end)
         offset = self.cell * 0.05
-        self.canvas.create_line(
-            sx,
-            sy,
-            ex,
-            ey,
-            width=self.cell * 0.15,
-            fill="#d62828",
-            capstyle=tk.ROUND,
-        )
+        self.canvas.coords(self._win_line_id, sx, sy, ex, ey)
+        self.canvas.itemconfigure(self._win_line_id, state="normal")
+        self._win_line_shown = True
+        # Stones are created after the line item, so lift it back above them
+        self.canvas.tag_raise(self._win_line_id)
 
     def reset_game(self, schedule_sim: bool = True):
-        self.board = Board(size=self.size)
+        self.board = new_board(self.size)
         self.current_player = 1
         if self.simulate and self.game_mode == "ai_ai":
-            self.status.set("Simulation: black vs white")
+            self._set_status("Simulation: black vs white")
         else:
             self._update_turn_status()
         if self.sim_after_id is not None:
             self.window.after_cancel(self.sim_after_id)
             self.sim_after_id = None
         self._clear_end_popup()
-        self.canvas.delete("all")
-        self._draw_grid()
+        # The grid never changes; only clear the stones and the winning line
+        self._pending_stones.clear()
+        self.canvas.delete("stone")
+        self.canvas.itemconfigure(self._win_line_id, state="hidden")
+        self._win_line_shown = False
         if (
             schedule_sim
             and self.simulate
@@ -251,43 +340,48 @@ class GomokuGUI:
             self.window.after_cancel(self.sim_after_id)
         if initial:
             self.current_player = 1
-            self.status.set("Simulation running (black to move)")
+            self._set_status("Simulation running (black to move)")
         self.sim_after_id = self.window.after(self.move_delay, self._sim_move)
 
     def _sim_move(self):
-        if self._check_end():
-            return
+        # This timer has fired, so there is nothing left to cancel when rescheduling
+        self.sim_after_id = None
+        # The previous tick already checked its move and stops scheduling once the game
+        # has ended, so there is nothing to check before this move
         player = self.current_player
         color = "black" if player == 1 else "white"
         move = self.engine.choose_move(self.board, player)
         placed = self.board.place_move(move, player)
         if not placed:
-            self.status.set(f"Simulation stopped: no move for {color}")
+            self._set_status(f"Simulation stopped: no move for {color}")
             return
-        self._draw_stone(move, color)
+        self._draw_stone(move, player)
         try:
             self._play_move_sound(player)
         except Exception:
             pass
-        if self._check_end():
+        if self._check_end(move, player):
             return
         self.current_player *= -1
         next_color = "black" if self.current_player == 1 else "white"
-        self.status.set(f"Simulation running ({next_color} to move)")
+        self._set_status(f"Simulation running ({next_color} to move)")
         self._schedule_next_sim_move()
 
     def _build_start_screen(self):
         for widget in self.start_frame.winfo_children():
             widget.destroy()
+        # The start frame fills the window; keep the menu centred in it
+        menu = tk.Frame(self.start_frame, bg="#1f1f1f")
+        menu.place(relx=0.5, rely=0.5, anchor="center")
         tk.Label(
-            self.start_frame,
+            menu,
             text="Gomoku AI",
             fg="#ffd166",
             bg="#1f1f1f",
             font=("Helvetica", 48, "bold"),
             pady=40,
         ).pack()
-        btn_frame = tk.Frame(self.start_frame, bg="#1f1f1f")
+        btn_frame = tk.Frame(menu, bg="#1f1f1f")
         btn_frame.pack(pady=10)
         tk.Button(
             btn_frame,
@@ -308,32 +402,46 @@ class GomokuGUI:
         )
 
     def _show_start_screen(self):
-        self.game_frame.pack_forget()
-        self.start_frame.pack(expand=True)
+        self.start_frame.tkraise()
 
     def _start_game(self, mode: str):
-        self.start_frame.pack_forget()
-        self.game_frame.pack(expand=True, fill="both")
-        self.window.update_idletasks()  # render immediately for faster perceived transition
+        self.game_frame.tkraise()
         self.game_started = True
         self.game_mode = mode
         self.simulate = mode == "ai_ai"
-        self.reset_game(schedule_sim=True)
+        # Reset once Tk has drawn the game screen instead of forcing a layout pass here
+        self.window.after_idle(lambda: self.reset_game(schedule_sim=True))
 
     def _clear_end_popup(self):
         if self.end_popup is not None:
             self.end_popup.destroy()
             self.end_popup = None
 
+    def _set_status(self, text: str):
+        # Several updates in one event-loop turn collapse into a single label redraw,
+        # and text that is already showing is not written again
+        if self._status_after is None and text == self._shown_status:
+            return
+        self._pending_status = text
+        if self._status_after is None:
+            self._status_after = self.window.after_idle(self._flush_status)
+
+    def _flush_status(self):
+        self._status_after = None
+        text, self._pending_status = self._pending_status, None
+        if text is not None and text != self._shown_status:
+            self._shown_status = text
+            self.status.set(text)
+
     def _update_turn_status(self):
         if self.simulate and self.game_mode == "ai_ai":
             next_color = "black" if self.current_player == 1 else "white"
-            self.status.set(f"Simulation running ({next_color} to move)")
+            self._set_status(f"Simulation running ({next_color} to move)")
             return
         if self.game_mode == "human_ai":
-            self.status.set("Turn: Human" if self.current_player == 1 else "Turn: AI")
+            self._set_status("Turn: Human" if self.current_player == 1 else "Turn: AI")
         else:
-            self.status.set("Turn: Black" if self.current_player == 1 else "Turn: White")
+            self._set_status("Turn: Black" if self.current_player == 1 else "Turn: White")
 
     def _show_end_popup(self, message: str):
         if self.end_popup is not None:
@@ -365,23 +473,28 @@ class GomokuGUI:
             self.sim_after_id = None
 
         # Instantly show the start screen for a snappier feel
-        self.game_frame.pack_forget()
-        self.start_frame.pack(expand=True)
-        self.window.update_idletasks()
-
-        # Reset state in the background after UI swap
-        self.board = Board(size=self.size)
-        self.current_player = 1
+        self.start_frame.tkraise()
         self.simulate = False
         self.game_mode = "human_ai"
         self.game_started = False
         self._clear_end_popup()
-        self.canvas.delete("all")
-        self._draw_grid()
-        self.status.set("Turn: Human")
+        # Clear the board once Tk is idle, after the start screen is drawn
+        self.window.after_idle(self._clear_game)
+
+    def _clear_game(self):
+        self.board = new_board(self.size)
+        self.current_player = 1
+        self._pending_stones.clear()
+        self.canvas.delete("stone")
+        self.canvas.itemconfigure(self._win_line_id, state="hidden")
+        self._win_line_shown = False
+        self._set_status("Turn: Human")
 
     def run(self):
-        self.window.mainloop()
+        try:
+            self.window.mainloop()
+        finally:
+            self.engine.close()
 
     # Sound helpers
     def _init_sounds(self):
@@ -390,12 +503,17 @@ class GomokuGUI:
         available or files are missing, fall back to tkinter bell.
         """
         base_dir = os.path.join(os.path.dirname(__file__), "sounds")
-        files = {
-            "move": os.path.join(base_dir, "move.wav"),
-            "win": os.path.join(base_dir, "win.wav"),
-            "lose": os.path.join(base_dir, "lose.wav"),
-            "draw": os.path.join(base_dir, "draw.wav"),
-        }
+        # One directory listing instead of a stat per sound file
+        available = set(os.listdir(base_dir)) if os.path.isdir(base_dir) else set()
+        # pygame is only worth importing when there is something for it to play
+        if not any(name.endswith(".wav") for name in available):
+            return
+        try:
+            import pygame
+
+            self._pygame = pygame
+        except Exception:
+            self._pygame = None
         if self._pygame:
             try:
                 if not self._pygame.mixer.get_init():
@@ -403,10 +521,15 @@ class GomokuGUI:
             except Exception:
                 # mixer init failed -> disable pygame usage
                 self._pygame = None
-        for k, path in files.items():
-            if os.path.exists(path) and self._pygame:
+        for k, fname in (
+            ("move", "move.wav"),
+            ("win", "win.wav"),
+            ("lose", "lose.wav"),
+            ("draw", "draw.wav"),
+        ):
+            if fname in available and self._pygame:
                 try:
-                    self._sounds[k] = self._pygame.mixer.Sound(path)
+                    self._sounds[k] = self._pygame.mixer.Sound(os.path.join(base_dir, fname))
                 except Exception:
                     # skip loading this sound
                     pass
@@ -453,6 +576,9 @@ def main():
         default=450,
         help="Delay between simulator moves in ms (only with --simulate)",
     )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Processes for the AI search (default 1)"
+    )
     args = parser.parse_args()
 
     gui = GomokuGUI(
@@ -462,6 +588,7 @@ def main():
         time_limit=args.time,
         simulate=args.simulate,
         move_delay=args.delay,
+        workers=args.workers,
     )
     gui.run()
 
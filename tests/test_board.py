@@ -1,36 +1,174 @@
 import os
 import sys
 
+import pytest
+
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-from src.board import Board  # noqa: E402
+from src.board import Board, Board15, new_board  # noqa: E402
 from src.engine import Engine  # noqa: E402
 from src.evaluation import evaluate  # noqa: E402
 
 
+@pytest.fixture(scope="module")
+def engine():
+    return Engine(max_depth=2, time_limit=1.0)
+
+
 def test_win_detection_row():
     b = Board(size=10)
-    for y in range(5):
-        assert b.place_move((0, y), 1)
+    assert b.place_moves([((0, y), 1) for y in range(5)])
     assert b.get_winner() == 1
 
 
 def test_evaluation_prefers_winning():
     b = Board(size=10)
-    for y in range(4):
-        b.place_move((0, y), 1)
+    b.place_moves([((0, y), 1) for y in range(4)])
     score_before = evaluate(b, 1)
     b.place_move((0, 4), 1)
     score_after = evaluate(b, 1)
     assert score_after > score_before
 
 
-def test_engine_returns_move():
+def test_engine_returns_move(engine):
     b = Board(size=10)
-    engine = Engine(max_depth=2, time_limit=1.0)
     move = engine.choose_move(b, 1)
     assert move is not None
     assert b.in_bounds(move)
 
+
+def test_hash_tracks_transpositions():
+    a = Board(size=10)
+    a.place_move((4, 4), 1)
+    a.place_move((5, 5), -1)
+    a.place_move((4, 5), 1)
+    b = Board(size=10)
+    b.place_move((4, 5), 1)
+    b.place_move((5, 5), -1)
+    b.place_move((4, 4), 1)
+    assert a.hash == b.hash
+    for _ in range(3):
+        a.undo_move()
+    assert a.hash == 0
+
+
+def test_win_detection_diagonal_not_wrapped():
+    b = Board(size=10)
+    # Stones at the right edge of one row and the left edge of the next are not a line
+    for pos in [(0, 7), (0, 8), (0, 9), (1, 0), (1, 1)]:
+        assert b.place_move(pos, 1)
+    assert b.get_winner() is None
+    for i in range(5):
+        b.place_move((5 + i, 9 - i), -1)
+    assert b.get_winner_line() == (-1, [(5, 9), (6, 8), (7, 7), (8, 6), (9, 5)])
+
+
+def test_incremental_evaluation_matches_fresh_board():
+    b = Board(size=10)
+    moves = [(4, 4), (4, 5), (5, 5), (3, 3), (6, 6), (5, 4)]
+    for i, pos in enumerate(moves):
+        b.place_move(pos, 1 if i % 2 == 0 else -1)
+        evaluate(b, 1)
+    b.undo_move()
+    b.undo_move()
+    fresh = Board(size=10)
+    for i, pos in enumerate(moves[:-2]):
+        fresh.place_move(pos, 1 if i % 2 == 0 else -1)
+    assert evaluate(b, 1) == evaluate(fresh, 1)
+    assert evaluate(b, -1) == evaluate(fresh, -1)
+
+
+def test_engine_completes_five():
+    b = Board(size=10)
+    for y in range(1, 5):
+        b.place_move((4, y), -1)
+        b.place_move((7, y + 2), 1)
+    engine = Engine(max_depth=3, time_limit=5.0)
+    assert engine.choose_move(b, -1) in [(4, 0), (4, 5)]
+
+
+def test_find_immediate_threats():
+    b = Board(size=10)
+    for y in (0, 1, 3, 4):
+        b.place_move((2, y), 1)
+    for x in range(6, 10):
+        b.place_move((x, 14 - x), -1)
+    assert b.find_immediate_threats(1) == [(2, 2)]
+    assert b.find_immediate_threats(-1) == [(5, 9)]
+
+
+def test_search_timeout_restores_board():
+    b = Board(size=15)
+    for i, pos in enumerate([(7, 7), (7, 8), (8, 8), (6, 6)]):
+        b.place_move(pos, 1 if i % 2 == 0 else -1)
+    moves_before = b.moves[:]
+    hash_before = b.hash
+    engine = Engine(max_depth=8, time_limit=0.05)
+    move = engine.choose_move(b, 1)
+    assert b.is_empty(move)
+    assert b.moves == moves_before
+    assert b.hash == hash_before
+
+
+def test_parallel_root_matches_serial_search():
+    import multiprocessing
+    import time
+
+    from src import search
+
+    b = Board(size=15)
+    for i, pos in enumerate([(7, 7), (7, 8), (8, 8), (6, 6), (8, 7)]):
+        b.place_move(pos, 1 if i % 2 == 0 else -1)
+    # Deep enough that interior nodes are pruned to their best few moves
+    serial = search.iterative_deepening(b, -1, max_depth=4, time_limit=60.0)
+    with multiprocessing.Pool(2) as pool:
+        # The pool outlives a search, as it does inside Engine
+        search.iterative_deepening(b, 1, max_depth=3, time_limit=60.0, pool=pool, workers=2)
+        parallel = search.iterative_deepening(
+            b, -1, max_depth=4, time_limit=60.0, pool=pool, workers=2
+        )
+    assert parallel.value == serial.value
+    assert b.is_empty(parallel.move)
+
+    # A worker drops its tables when handed the first chunk of a new search
+    search.TT[0] = (99, 0, search.EXACT, None)
+    deadline_ns = time.monotonic_ns() + 10**9
+    search._search_root_chunk((b, [], 1, -1, deadline_ns, search._search_count[0] + 1))
+    assert 0 not in search.TT
+
+
+def test_new_board_specialises_standard_size():
+    b = new_board(15)
+    assert isinstance(b, Board15)
+    assert isinstance(new_board(9), Board) and not isinstance(new_board(9), Board15)
+    b.place_move((7, 7), 1)
+    b.place_move((3, 4), -1)
+    copy = b.clone()
+    assert type(copy) is Board15
+    assert copy.hash == b.hash and copy.moves == b.moves
+
+
+def test_check_win_at_walks_lines_through_position():
+    b = Board(size=15)
+    b.place_moves([((2 + i, 9 - i), 1) for i in range(5)] + [((0, 0), -1)])
+    assert b.check_win_at((4, 7), 1) == (1, [(2 + i, 9 - i) for i in range(5)])
+    assert b.check_win_at((0, 0), -1) is None
+    assert b.check_win_at((4, 7), -1) is None
+
+
+def test_move_ordering_keeps_forcing_fours():
+    from src.search import _order_moves
+
+    b = Board(size=15)
+    b.place_moves(
+        [((7, 5), 1), ((0, 0), -1), ((7, 6), 1), ((14, 14), -1), ((7, 7), 1), ((7, 8), -1)]
+    )
+    assert sorted(b.find_four_moves(1)) == [(7, 3), (7, 4)]
+    assert b.find_four_moves(-1) == []
+    # (7, 4) makes a four the pattern table undervalues; pruning must keep it both as
+    # black's move and as white's block
+    for depth in (1, 3):
+        assert (7, 4) in _order_moves(b, 1, ply=1, depth=depth)
+        assert (7, 4) in _order_moves(b, 1, ply=1, depth=depth, color=-1)